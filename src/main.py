@@ -88,7 +88,7 @@ from src.constants import (
     SESSION_CLEANUP_INTERVAL_MINUTES,
 )
 from src.model_service import model_service
-from src.request_cache import request_cache
+from src.request_cache import get_request_cache
 from src.cost_tracker import cost_tracker, UsageRecord
 
 # Load environment variables
@@ -1027,10 +1027,7 @@ async def generate_streaming_response(
                 prompt = f"{schema_instructions}\n\n{prompt}"
                 logger.info(f"JSON schema mode (streaming): injected schema into prompt")
             else:
-                if system_prompt:
-                    system_prompt = f"{MessageAdapter.JSON_MODE_INSTRUCTION}\n\n{system_prompt}"
-                else:
-                    system_prompt = MessageAdapter.JSON_MODE_INSTRUCTION
+                system_prompt = MessageAdapter.apply_json_mode(system_prompt)
                 prompt = prompt + MessageAdapter.JSON_PROMPT_SUFFIX
                 logger.info(
                     "JSON mode enabled (streaming) - instruction added to system and user prompt"
@@ -1540,9 +1537,12 @@ async def chat_completions(
                 "1",
                 "yes",
             )
+            cache_key = None
+            request_cache = get_request_cache()
             if cache_enabled and request_cache.enabled:
-                request_dict = request_body.model_dump()
-                cached_response = request_cache.get(request_dict)
+                # Compute the key once; a miss reuses it when storing below.
+                cache_key = request_cache.compute_key(request_body.model_dump())
+                cached_response = request_cache.get_by_key(cache_key)
                 if cached_response:
                     logger.info(f"Cache hit for request {request_id}")
                     # Return cached response with updated request ID
@@ -1610,10 +1610,7 @@ async def chat_completions(
                     )
                 else:
                     # Basic JSON object mode
-                    if system_prompt:
-                        system_prompt = f"{MessageAdapter.JSON_MODE_INSTRUCTION}\n\n{system_prompt}"
-                    else:
-                        system_prompt = MessageAdapter.JSON_MODE_INSTRUCTION
+                    system_prompt = MessageAdapter.apply_json_mode(system_prompt)
                     prompt = prompt + MessageAdapter.JSON_PROMPT_SUFFIX
                     logger.info("JSON mode enabled - instruction added to system and user prompt")
 
@@ -1731,11 +1728,10 @@ async def chat_completions(
                 ),
             )
 
-            # Store in cache if enabled
-            if cache_enabled and request_cache.enabled:
-                request_dict = request_body.model_dump()
+            # Store in cache if enabled (key computed during the lookup above)
+            if cache_key is not None:
                 response_dict = response.model_dump()
-                request_cache.set(request_dict, response_dict)
+                request_cache.set_by_key(cache_key, response_dict)
                 logger.debug(f"Cached response for request {request_id}")
 
             # One structured info line per successful completion. Makes Grafana
@@ -3170,7 +3166,7 @@ async def get_cache_stats(
     Enable cache by setting REQUEST_CACHE_ENABLED=true environment variable.
     """
     await verify_api_key(request, credentials)
-    return request_cache.get_stats()
+    return get_request_cache().get_stats()
 
 
 @app.post("/v1/cache/clear")
@@ -3183,7 +3179,7 @@ async def clear_cache(
     Returns the number of entries that were cleared.
     """
     await verify_api_key(request, credentials)
-    count = request_cache.clear()
+    count = get_request_cache().clear()
     return {"message": f"Cleared {count} cache entries", "entries_cleared": count}
 
 
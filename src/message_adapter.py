@@ -1,10 +1,23 @@
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 from src.models import Message
 import re
 import json
 import logging
 
+try:
+    # Optional fast path: orjson's Rust parser validates candidates 2-5x
+    # faster than stdlib json and raises cheaper exceptions. Used only when
+    # already present in the environment; stdlib json is the fallback.
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+_json_loads = _orjson.loads if _orjson is not None else json.loads
+# Both backends raise a ValueError subclass on invalid input.
+_JSONDecodeError = ValueError
+
 logger = logging.getLogger(__name__)
 
 
@@ -62,6 +75,29 @@ def _strip_tag_blocks(content: str, tag: str) -> str:
         i = end + len(close_tag)
 
 
+def _present_tool_tags(content: str) -> frozenset:
+    """Return the subset of ``_TOOL_TAGS`` whose open tag appears in ``content``.
+
+    One walk over the ``<`` positions replaces eleven full-content substring
+    scans: at each ``<`` the candidate tag names are compared in place with
+    ``str.startswith``, which rejects non-matches after a character or two.
+    """
+    found = set()
+    i = content.find("<")
+    total = len(_TOOL_TAGS)
+    while i != -1 and len(found) < total:
+        for tag in _TOOL_TAGS:
+            if (
+                tag not in found
+                and content.startswith(tag, i + 1)
+                and content.startswith(">", i + 1 + len(tag))
+            ):
+                found.add(tag)
+                break
+        i = content.find("<", i + 1)
+    return frozenset(found)
+
+
 def _extract_first_block(content: str, tag: str) -> Optional[str]:
     """Return the inner text of the first ``<tag>...</tag>`` block or ``None``."""
     open_tag = f"<{tag}>"
@@ -84,11 +120,246 @@ _IMAGE_RE = re.compile(
     r"\[Image:[^\]]{0,1024}\]" r"|data:image/[A-Za-z0-9.+-]{1,32};base64,[^\s]{0,65536}"
 )
 
-# Whitespace collapser used at the tail of filter_content.
-_MULTI_NEWLINE_RE = re.compile(r"\n\s*\n\s*\n")
+# Role prefixes for messages_to_prompt, resolved via one dict lookup per
+# message instead of an if/elif chain.
+_ROLE_PREFIXES = {"user": "Human: ", "assistant": "Assistant: "}
+
+
+def _collapse_newline_runs(content: str) -> str:
+    """Collapse whitespace runs containing three or more newlines to ``\\n\\n``.
+
+    Equivalent to ``re.sub(r"\\n\\s*\\n\\s*\\n", "\\n\\n", content)`` (the
+    previous implementation) but runs as a single linear scan built on
+    ``str.find`` instead of the regex VM: within each whitespace run the
+    stretch from the first to the last newline is replaced when the run
+    holds at least three newlines, leaving surrounding non-newline padding
+    untouched. Runs extend through any whitespace ``str.isspace`` accepts,
+    matching the Unicode semantics of ``\s`` (NBSP-padded blank lines
+    collapse too, not just ASCII padding).
+    """
+    first_nl = content.find("\n")
+    if first_nl == -1:
+        return content
+
+    parts: List[str] = []
+    i = 0
+    n = len(content)
+    j = first_nl
+    while j != -1:
+        # Extend through the whitespace run that starts at this newline,
+        # tracking the last newline seen and the newline count.
+        last_nl = j
+        nl_count = 1
+        k = j + 1
+        while k < n:
+            char = content[k]
+            if char == "\n":
+                last_nl = k
+                nl_count += 1
+            elif not char.isspace():
+                break
+            k += 1
+        if nl_count >= 3:
+            parts.append(content[i:j])
+            parts.append("\n\n")
+            i = last_nl + 1
+        j = content.find("\n", k)
+
+    if not parts:
+        return content
+    parts.append(content[i:])
+    return "".join(parts)
+
+
+def _iter_code_blocks(content: str) -> Iterator[str]:
+    """Yield the inner text of each ```-fenced block in document order.
+
+    Replaces the lazy ``[\\s\\S]*?`` fence regex: like the tag strippers
+    above, this walks the content with ``str.find`` so unterminated or
+    fence-storm inputs stay strictly linear instead of rescanning. A
+    leading ``json`` language tag (any case) is dropped; callers strip
+    the yielded text before validating it.
+    """
+    i = 0
+    while True:
+        start = content.find("```", i)
+        if start == -1:
+            return
+        inner_start = start + 3
+        if content[inner_start : inner_start + 4].lower() == "json":
+            inner_start += 4
+        end = content.find("```", inner_start)
+        if end == -1:
+            return
+        yield content[inner_start:end]
+        i = end + 3
+
+
+# First characters that can start a JSON document: an object, an array, a
+# string, a number, or one of the true/false/null literals. Anything else
+# (e.g. "Sure, here..." prose) is a guaranteed json.loads failure, so callers
+# sniff this before paying for a full parse + exception on the common
+# non-JSON path.
+_JSON_START_CHARS = frozenset('{["-0123456789tfn')
+
+
+def _may_be_json(content: str) -> bool:
+    """Cheap sniff: can ``content`` possibly be a JSON document?
+
+    For objects and arrays the last character must pair with the first, so
+    ``{...`` followed by trailing prose is rejected without ever invoking
+    the parser. Callers pass stripped candidates, so no whitespace
+    tolerance is needed here.
+    """
+    first = content[:1]
+    if first == "{":
+        return content[-1:] == "}"
+    if first == "[":
+        return content[-1:] == "]"
+    return first in _JSON_START_CHARS
+
+
+# Shared decoder for prefix parsing: raw_decode parses the leading JSON
+# value in C and reports where it stopped, so "{...} trailing prose" is
+# resolved without walking the string in Python.
+_RAW_DECODER = json.JSONDecoder()
+
+
+def _raw_decode_prefix(content: str) -> Optional[str]:
+    """Return the leading JSON document of ``content``, or ``None``."""
+    try:
+        _, end = _RAW_DECODER.raw_decode(content)
+    except ValueError:
+        return None
+    return content[:end]
+
+
+# Contents longer than this bypass the extract_json memo cache so the LRU
+# never pins multi-hundred-KB responses in memory.
+_EXTRACT_CACHE_MAX_LEN = 64 * 1024
+
+
+@lru_cache(maxsize=512)
+def _extract_json_cached(content: str) -> Optional[str]:
+    """Memoized trampoline for ``MessageAdapter._extract_json_impl``."""
+    return MessageAdapter._extract_json_impl(content)
+
+
+@lru_cache(maxsize=64)
+def _apply_json_mode_cached(system_prompt: Optional[str]) -> str:
+    """Memoized JSON-mode system prompt concatenation.
+
+    Deployments typically reuse a handful of system prompts, so the hot
+    per-request concat collapses to a cache hit keyed by the prompt itself
+    (identity-keyed caching would be unsound once a string is collected).
+    """
+    if system_prompt:
+        return f"{MessageAdapter.JSON_MODE_INSTRUCTION}\n\n{system_prompt}"
+    return MessageAdapter.JSON_MODE_INSTRUCTION
+
+
+def _json_valid(candidate: str) -> bool:
+    """Return True if ``candidate`` parses as a complete JSON document.
 
+    Single choke point for validation probes: the parsed object is
+    discarded immediately and the decode error never escapes, so callers
+    branch on a bool instead of threading try/except through every
+    extraction strategy.
+    """
+    try:
+        _json_loads(candidate)
+        return True
+    except _JSONDecodeError:
+        return False
+
+
+# How many rejected spans _find_json_spans will re-enter per call. Each
+# re-entry rescans from one character inside a rejected span, so without a
+# bound, balanced-but-invalid nesting like "{" * n + "}" * n degrades the
+# scan to O(n^2); the cap keeps it O(n * k) while still rescuing the
+# common nested-candidate cases, which sit one or two levels in.
+_MAX_SPAN_RESCANS = 8
+
+
+def _find_json_spans(content: str) -> Iterator[Tuple[int, int]]:
+    """Yield ``(start, end)`` spans of balanced ``{...}``/``[...]`` candidates.
+
+    Scans forward tracking brace/bracket depth and JSON string state (with
+    ``\\`` escape handling), and emits a candidate span each time depth
+    returns to zero. Both object and array candidates come out of the same
+    scan, in positional order, so callers can try ``json.loads`` on each
+    until one parses. After emitting a span the scan resumes just inside
+    it - that path only runs when the caller rejects the span and pulls
+    again - so a valid candidate nested in an invalid outer span is still
+    seen (e.g. a valid array inside an object with unquoted keys).
+    Re-entries are capped at ``_MAX_SPAN_RESCANS`` to keep adversarial
+    nesting linear; past the cap the scan resumes after each span.
+    Unterminated candidates are simply never emitted.
+    """
+    find = content.find
+    n = len(content)
+    pos = 0
+    rescans = _MAX_SPAN_RESCANS
+    while pos < n:
+        # Jump to the next candidate opener at memchr speed; everything in
+        # between is prose and never inspected character by character.
+        brace = find("{", pos)
+        bracket = find("[", pos)
+        if brace == -1 and bracket == -1:
+            return
+        if bracket == -1 or (brace != -1 and brace < bracket):
+            start, open_char, close_char = brace, "{", "}"
+        else:
+            start, open_char, close_char = bracket, "[", "]"
 
-@dataclass
+        depth = 0
+        i = start
+        while i < n:
+            char = content[i]
+            if char == "\\":
+                i += 2  # escaped character, regardless of string state
+            elif char == '"':
+                # Skip the string body with str.find; a quote preceded by an
+                # odd run of backslashes is escaped and does not close it.
+                j = i + 1
+                while True:
+                    quote = find('"', j)
+                    if quote == -1:
+                        return  # unterminated string consumes the rest
+                    backslashes = quote - 1
+                    while content[backslashes] == "\\":
+                        backslashes -= 1
+                    if (quote - 1 - backslashes) % 2 == 0:
+                        break
+                    j = quote + 1
+                i = quote + 1
+            elif char == open_char:
+                depth += 1
+                i += 1
+            elif char == close_char:
+                depth -= 1
+                i += 1
+                if depth == 0:
+                    yield start, i
+                    break
+            else:
+                i += 1
+        else:
+            return  # candidate never closed
+
+        if rescans:
+            # Resume inside the span just emitted rather than past it: only
+            # pulled on when the caller rejects the span, this surfaces
+            # nested candidates an invalid outer span would otherwise
+            # swallow. The budget bounds how much rescanning rejections can
+            # provoke; once spent, the scan moves past each span instead.
+            rescans -= 1
+            pos = start + 1
+        else:
+            pos = i
+
+
+@dataclass(slots=True)
 class JsonExtractionResult:
     """Result of JSON extraction with metadata about the extraction process."""
 
@@ -162,6 +433,47 @@ class JsonFenceStripper:
         return result
 
 
+class PromptBuilder:
+    """Incrementally formats OpenAI messages into a Claude Code prompt.
+
+    Keeps the conversation as an append-only list of already-formatted
+    chunks, so callers replaying a growing history can hold one builder
+    across turns and append only the new messages instead of reformatting
+    the entire conversation each time. ``messages_to_prompt`` uses it for
+    the one-shot case.
+    """
+
+    __slots__ = ("_parts", "_system", "_last_role")
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._system: Optional[str] = None
+        self._last_role: Optional[str] = None
+
+    def append(self, message: Message) -> None:
+        """Format one message and add it to the prompt under construction."""
+        content = message.content or ""
+        role = message.role
+        if role == "system":
+            self._system = content
+        else:
+            prefix = _ROLE_PREFIXES.get(role)
+            if prefix is not None:
+                if self._parts:
+                    self._parts.append("\n\n")
+                self._parts.append(prefix)
+                self._parts.append(content)
+        self._last_role = role
+
+    def build(self) -> Tuple[str, Optional[str]]:
+        """Return ``(prompt, system_prompt)`` for the messages appended so far."""
+        prompt = "".join(self._parts)
+        # If the last message wasn't from the user, add a prompt for assistant
+        if self._last_role is not None and self._last_role != "user":
+            prompt += "\n\nHuman: Please continue."
+        return prompt, self._system
+
+
 class MessageAdapter:
     """Converts between OpenAI message format and Claude Code prompts."""
 
@@ -199,101 +511,94 @@ class MessageAdapter:
         "JSON Schema:\n{schema_json}"
     )
 
-    # Common preambles that Claude may add before JSON output
-    COMMON_PREAMBLES = [
-        "Here's the JSON:",
-        "Here is the JSON:",
-        "Here's the response:",
-        "Here is the response:",
-        "Here's your JSON:",
-        "Here is your JSON:",
-        "Here's the JSON response:",
-        "Here is the JSON response:",
-        "Here's the data:",
-        "Here is the data:",
-        "Here's the result:",
-        "Here is the result:",
-        "Here's the output:",
-        "Here is the output:",
-        "The JSON is:",
-        "JSON response:",
-        "Response:",
-        "Output:",
-        "Result:",
-    ]
+    # Common preambles that Claude may add before JSON output. Immutable,
+    # and length-sorted (longest first) so any prefix-overlapping pair
+    # resolves to the longest match both here and in the alternation below.
+    COMMON_PREAMBLES = tuple(
+        sorted(
+            [
+                "Here's the JSON:",
+                "Here is the JSON:",
+                "Here's the response:",
+                "Here is the response:",
+                "Here's your JSON:",
+                "Here is your JSON:",
+                "Here's the JSON response:",
+                "Here is the JSON response:",
+                "Here's the data:",
+                "Here is the data:",
+                "Here's the result:",
+                "Here is the result:",
+                "Here's the output:",
+                "Here is the output:",
+                "The JSON is:",
+                "JSON response:",
+                "Response:",
+                "Output:",
+                "Result:",
+            ],
+            key=len,
+            reverse=True,
+        )
+    )
+
+    # Compiled alternation over COMMON_PREAMBLES. One anchored C-level
+    # match replaces 19 Python-level lowercase-and-startswith probes (and
+    # the full-content .lower() allocation) per call.
+    _PREAMBLE_RE = re.compile(
+        "|".join(re.escape(p) for p in COMMON_PREAMBLES),
+        re.IGNORECASE,
+    )
+
+    # Canonical casing by lowercased preamble, for metadata reporting.
+    _PREAMBLE_CANON = {p.lower(): p for p in COMMON_PREAMBLES}
 
     @staticmethod
-    def _find_balanced_json(content: str, start_char: str, end_char: str) -> Optional[str]:
+    def _find_balanced_json(content: str) -> Optional[str]:
         """
-        Find balanced JSON structure using brace/bracket matching.
+        Find the first valid balanced JSON structure in ``content``.
 
-        Handles escaped quotes and braces inside strings correctly.
+        Uses the ``_find_json_spans`` scanner, which handles
+        escaped quotes and braces/brackets inside strings correctly and
+        emits both object and array candidates in positional order.
 
         Args:
             content: The content to search in
-            start_char: Opening character ('{' or '[')
-            end_char: Closing character ('}' or ']')
 
         Returns:
             Matched JSON substring or None if not found
         """
-        start_idx = content.find(start_char)
-        if start_idx == -1:
-            return None
-
-        depth = 0
-        in_string = False
-        escape_next = False
-
-        for i, char in enumerate(content[start_idx:], start=start_idx):
-            if escape_next:
-                escape_next = False
-                continue
-
-            if char == "\\":
-                escape_next = True
-                continue
-
-            if char == '"' and not escape_next:
-                in_string = not in_string
-                continue
-
-            if in_string:
-                continue
-
-            if char == start_char:
-                depth += 1
-            elif char == end_char:
-                depth -= 1
-                if depth == 0:
-                    candidate = content[start_idx : i + 1]
-                    try:
-                        json.loads(candidate)
-                        return candidate
-                    except json.JSONDecodeError:
-                        # Keep looking for next valid match
-                        return None
+        for span_start, span_end in _find_json_spans(content):
+            candidate = content[span_start:span_end]
+            if _json_valid(candidate):
+                return candidate
+            # Keep looking for the next balanced candidate
 
         return None
 
     @staticmethod
     def _log_extraction_diagnostics(content: str) -> None:
         """Log diagnostics to help debug JSON extraction failures."""
+        # Counting braces, fences and preambles over the whole response is
+        # wasted work when nothing will be emitted; bail before any of it.
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         logger.debug("=== JSON Extraction Diagnostics ===")
 
-        # Check for code fences
-        if "```" in content:
-            fence_count = content.count("```")
+        # Check for code fences (count doubles as the presence check)
+        fence_count = content.count("```")
+        if fence_count:
             logger.debug(f"Found {fence_count} code fence markers (```) in content")
             if fence_count % 2 != 0:
                 logger.debug("Odd number of fences - malformed code block?")
 
-        # Check for common preambles
-        content_lower = content.lower().strip()
-        for preamble in MessageAdapter.COMMON_PREAMBLES:
-            if content_lower.startswith(preamble.lower()):
-                logger.debug(f"Content starts with preamble: '{preamble}'")
-                break
+        # Check for common preambles. The anchored match only ever examines
+        # the first few dozen characters, so no full-content lowercase copy
+        # is made for what may be a megabyte-sized response.
+        preamble_match = MessageAdapter._PREAMBLE_RE.match(content.lstrip())
+        if preamble_match:
+            preamble = MessageAdapter._PREAMBLE_CANON[preamble_match.group(0).lower()]
+            logger.debug(f"Content starts with preamble: '{preamble}'")
 
         # Check brace/bracket balance
         open_braces = content.count("{")
@@ -335,6 +640,27 @@ class MessageAdapter:
         """
         Extract JSON from content.
 
+        Results are memoized in a small LRU cache: retry layers and the
+        enforce_json_format wrappers routinely re-run extraction on
+        identical content, and a dict hit is orders of magnitude cheaper
+        than re-scanning. Oversized content bypasses the cache so giant
+        responses are never pinned in memory.
+
+        Args:
+            content: The content to extract JSON from
+
+        Returns:
+            Extracted JSON string, or None if no valid JSON found
+        """
+        if not content or len(content) > _EXTRACT_CACHE_MAX_LEN:
+            return MessageAdapter._extract_json_impl(content)
+        return _extract_json_cached(content)
+
+    @staticmethod
+    def _extract_json_impl(content: str) -> Optional[str]:
+        """
+        Extract JSON from content.
+
         Priority order:
         1. Pure JSON (content is already valid JSON) - fast path
         2. Preamble removal + parse (strip common Claude preambles)
@@ -355,90 +681,85 @@ class MessageAdapter:
         original_content = content
         content = content.strip()
 
-        # Case 1: Try parsing as pure JSON first (fast path)
-        try:
-            json.loads(content)
+        # Case 1: Try parsing as pure JSON first (fast path). Sniff the first
+        # character before parsing so prose responses skip straight to
+        # extraction without paying for a doomed parse + exception.
+        if _may_be_json(content) and _json_valid(content):
             logger.debug(f"extract_json: Already valid JSON ({len(content)} chars)")
             return content
-        except json.JSONDecodeError:
-            pass
+
+        # Case 1b: content leads with an object/array but carries a trailing
+        # epilogue. raw_decode parses the prefix in C and reports where it
+        # stopped, sparing the balanced scanner below. Skipped when fences
+        # are present so code-block extraction keeps priority. The emptiness
+        # check matters: whitespace-only input strips down to "".
+        if content and content[0] in "{[" and "```" not in content:
+            prefix = _raw_decode_prefix(content)
+            if prefix is not None:
+                logger.debug(f"extract_json: Extracted leading JSON ({len(prefix)} chars)")
+                return prefix
 
         # Case 2: Try removing common preambles
-        content_lower = content.lower()
-        for preamble in MessageAdapter.COMMON_PREAMBLES:
-            if content_lower.startswith(preamble.lower()):
-                stripped = content[len(preamble) :].strip()
-                try:
-                    json.loads(stripped)
-                    logger.debug(
-                        f"extract_json: Extracted after removing preamble '{preamble}' ({len(stripped)} chars)"
-                    )
-                    return stripped
-                except json.JSONDecodeError:
-                    # Preamble removed but still not valid - try other methods
-                    break
+        preamble_match = MessageAdapter._PREAMBLE_RE.match(content)
+        if preamble_match:
+            stripped = content[preamble_match.end() :].lstrip()
+            if _may_be_json(stripped) and _json_valid(stripped):
+                logger.debug(
+                    f"extract_json: Extracted after removing preamble "
+                    f"'{preamble_match.group(0)}' ({len(stripped)} chars)"
+                )
+                return stripped
+            # Preamble removed but still not valid - try other methods
 
-        # Case 3: Extract from markdown code blocks
-        code_block_patterns = [
-            r"```json\s*([\s\S]*?)\s*```",  # ```json block
-            r"```\s*([\s\S]*?)\s*```",  # generic ``` block
-        ]
-
-        for pattern in code_block_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            for match in matches:
-                match = match.strip()
-                try:
-                    json.loads(match)
+        # Case 3: Extract from markdown code blocks, lazily and in order
+        if "```" in content:
+            for block in _iter_code_blocks(content):
+                match = block.strip()
+                if not _may_be_json(match):
+                    continue
+                if _json_valid(match):
                     logger.debug(f"extract_json: Extracted from code block ({len(match)} chars)")
                     return match
-                except json.JSONDecodeError:
-                    logger.debug("extract_json: Code block match failed validation")
-                    continue
-
-        # Case 4: Balanced brace/bracket matching (new algorithm)
-        # Try object first
-        balanced_obj = MessageAdapter._find_balanced_json(content, "{", "}")
-        if balanced_obj:
-            logger.debug(
-                f"extract_json: Extracted via balanced brace matching ({len(balanced_obj)} chars)"
-            )
-            return balanced_obj
-
-        # Try array
-        balanced_arr = MessageAdapter._find_balanced_json(content, "[", "]")
-        if balanced_arr:
-            logger.debug(
-                f"extract_json: Extracted via balanced bracket matching ({len(balanced_arr)} chars)"
-            )
-            return balanced_arr
+                logger.debug("extract_json: Code block match failed validation")
 
-        # Case 5: First-to-last fallback (less precise but handles some edge cases)
+        # Cases 4 and 5 both need at least one opener; a pair of memchr
+        # scans settles that before any scanner work, and case 5 reuses the
+        # positions instead of re-scanning.
         first_brace = content.find("{")
-        last_brace = content.rfind("}")
-        if first_brace != -1 and last_brace > first_brace:
-            candidate = content[first_brace : last_brace + 1]
-            try:
-                json.loads(candidate)
-                logger.debug(
-                    f"extract_json: Extracted via first-to-last brace ({len(candidate)} chars)"
-                )
-                return candidate
-            except json.JSONDecodeError:
-                pass
-
         first_bracket = content.find("[")
-        last_bracket = content.rfind("]")
-        if first_bracket != -1 and last_bracket > first_bracket:
-            candidate = content[first_bracket : last_bracket + 1]
-            try:
-                json.loads(candidate)
+        has_opener = first_brace != -1 or first_bracket != -1
+
+        # Case 4: Balanced brace/bracket matching (single-pass scanner)
+        if has_opener:
+            balanced = MessageAdapter._find_balanced_json(content)
+            if balanced:
                 logger.debug(
-                    f"extract_json: Extracted via first-to-last bracket ({len(candidate)} chars)"
+                    f"extract_json: Extracted via balanced brace/bracket matching ({len(balanced)} chars)"
                 )
-                return candidate
-            except json.JSONDecodeError:
-                pass
+                return balanced
+
+        # Case 5: First-to-last fallback (less precise but handles some edge
+        # cases). rfind runs only when the matching opener exists, so content
+        # without braces/brackets costs two memchr scans in total, not four.
+        if first_brace != -1:
+            last_brace = content.rfind("}")
+            if last_brace > first_brace:
+                candidate = content[first_brace : last_brace + 1]
+                if _json_valid(candidate):
+                    logger.debug(
+                        f"extract_json: Extracted via first-to-last brace ({len(candidate)} chars)"
+                    )
+                    return candidate
+
+        if first_bracket != -1:
+            last_bracket = content.rfind("]")
+            if last_bracket > first_bracket:
+                candidate = content[first_bracket : last_bracket + 1]
+                if _json_valid(candidate):
+                    logger.debug(
+                        f"extract_json: Extracted via first-to-last bracket ({len(candidate)} chars)"
+                    )
+                    return candidate
 
         # Extraction failed - log diagnostics
         logger.warning(f"extract_json: No valid JSON found in {len(content)} chars")
@@ -471,9 +792,8 @@ class MessageAdapter:
         original_length = len(content)
         content = content.strip()
 
-        # Case 1: Try parsing as pure JSON first (fast path)
-        try:
-            json.loads(content)
+        # Case 1: Try parsing as pure JSON first (fast path, prefix-sniffed)
+        if _may_be_json(content) and _json_valid(content):
             return JsonExtractionResult(
                 content=content,
                 success=True,
@@ -481,39 +801,41 @@ class MessageAdapter:
                 original_length=original_length,
                 extracted_length=len(content),
             )
-        except json.JSONDecodeError:
-            pass
+
+        # Case 1b: leading JSON with a trailing epilogue (see _extract_json_impl);
+        # the emptiness check keeps whitespace-only input (stripped to "") safe
+        if content and content[0] in "{[" and "```" not in content:
+            prefix = _raw_decode_prefix(content)
+            if prefix is not None:
+                return JsonExtractionResult(
+                    content=prefix,
+                    success=True,
+                    method="brace_match",
+                    original_length=original_length,
+                    extracted_length=len(prefix),
+                )
 
         # Case 2: Try removing common preambles
-        content_lower = content.lower()
-        for preamble in MessageAdapter.COMMON_PREAMBLES:
-            if content_lower.startswith(preamble.lower()):
-                stripped = content[len(preamble) :].strip()
-                try:
-                    json.loads(stripped)
-                    return JsonExtractionResult(
-                        content=stripped,
-                        success=True,
-                        method="preamble_removed",
-                        original_length=original_length,
-                        extracted_length=len(stripped),
-                        preamble_found=preamble,
-                    )
-                except json.JSONDecodeError:
-                    break
+        preamble_match = MessageAdapter._PREAMBLE_RE.match(content)
+        if preamble_match:
+            stripped = content[preamble_match.end() :].lstrip()
+            if _may_be_json(stripped) and _json_valid(stripped):
+                return JsonExtractionResult(
+                    content=stripped,
+                    success=True,
+                    method="preamble_removed",
+                    original_length=original_length,
+                    extracted_length=len(stripped),
+                    preamble_found=MessageAdapter._PREAMBLE_CANON[preamble_match.group(0).lower()],
+                )
 
-        # Case 3: Extract from markdown code blocks
-        code_block_patterns = [
-            r"```json\s*([\s\S]*?)\s*```",
-            r"```\s*([\s\S]*?)\s*```",
-        ]
-
-        for pattern in code_block_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            for match in matches:
-                match = match.strip()
-                try:
-                    json.loads(match)
+        # Case 3: Extract from markdown code blocks, lazily and in order
+        if "```" in content:
+            for block in _iter_code_blocks(content):
+                match = block.strip()
+                if not _may_be_json(match):
+                    continue
+                if _json_valid(match):
                     return JsonExtractionResult(
                         content=match,
                         success=True,
@@ -521,62 +843,51 @@ class MessageAdapter:
                         original_length=original_length,
                         extracted_length=len(match),
                     )
-                except json.JSONDecodeError:
-                    continue
-
-        # Case 4: Balanced brace/bracket matching
-        balanced_obj = MessageAdapter._find_balanced_json(content, "{", "}")
-        if balanced_obj:
-            return JsonExtractionResult(
-                content=balanced_obj,
-                success=True,
-                method="brace_match",
-                original_length=original_length,
-                extracted_length=len(balanced_obj),
-            )
 
-        balanced_arr = MessageAdapter._find_balanced_json(content, "[", "]")
-        if balanced_arr:
-            return JsonExtractionResult(
-                content=balanced_arr,
-                success=True,
-                method="brace_match",
-                original_length=original_length,
-                extracted_length=len(balanced_arr),
-            )
-
-        # Case 5: First-to-last fallback
+        # Cases 4 and 5 both need at least one opener (see extract_json);
+        # case 5 reuses the scanned positions.
         first_brace = content.find("{")
-        last_brace = content.rfind("}")
-        if first_brace != -1 and last_brace > first_brace:
-            candidate = content[first_brace : last_brace + 1]
-            try:
-                json.loads(candidate)
-                return JsonExtractionResult(
-                    content=candidate,
-                    success=True,
-                    method="fallback",
-                    original_length=original_length,
-                    extracted_length=len(candidate),
-                )
-            except json.JSONDecodeError:
-                pass
-
         first_bracket = content.find("[")
-        last_bracket = content.rfind("]")
-        if first_bracket != -1 and last_bracket > first_bracket:
-            candidate = content[first_bracket : last_bracket + 1]
-            try:
-                json.loads(candidate)
+        has_opener = first_brace != -1 or first_bracket != -1
+
+        # Case 4: Balanced brace/bracket matching (single-pass scanner)
+        if has_opener:
+            balanced = MessageAdapter._find_balanced_json(content)
+            if balanced:
                 return JsonExtractionResult(
-                    content=candidate,
+                    content=balanced,
                     success=True,
-                    method="fallback",
+                    method="brace_match",
                     original_length=original_length,
-                    extracted_length=len(candidate),
+                    extracted_length=len(balanced),
                 )
-            except json.JSONDecodeError:
-                pass
+
+        # Case 5: First-to-last fallback (rfind only when an opener exists)
+        if first_brace != -1:
+            last_brace = content.rfind("}")
+            if last_brace > first_brace:
+                candidate = content[first_brace : last_brace + 1]
+                if _json_valid(candidate):
+                    return JsonExtractionResult(
+                        content=candidate,
+                        success=True,
+                        method="fallback",
+                        original_length=original_length,
+                        extracted_length=len(candidate),
+                    )
+
+        if first_bracket != -1:
+            last_bracket = content.rfind("]")
+            if last_bracket > first_bracket:
+                candidate = content[first_bracket : last_bracket + 1]
+                if _json_valid(candidate):
+                    return JsonExtractionResult(
+                        content=candidate,
+                        success=True,
+                        method="fallback",
+                        original_length=original_length,
+                        extracted_length=len(candidate),
+                    )
 
         # Failed
         return JsonExtractionResult(
@@ -662,26 +973,22 @@ class MessageAdapter:
         Convert OpenAI messages to Claude Code prompt format.
         Returns (prompt, system_prompt)
         """
-        system_prompt = None
-        conversation_parts = []
-
+        builder = PromptBuilder()
         for message in messages:
-            content = message.content or ""
-            if message.role == "system":
-                system_prompt = content
-            elif message.role == "user":
-                conversation_parts.append(f"Human: {content}")
-            elif message.role == "assistant":
-                conversation_parts.append(f"Assistant: {content}")
-
-        # Join conversation parts
-        prompt = "\n\n".join(conversation_parts)
+            builder.append(message)
+        return builder.build()
 
-        # If the last message wasn't from the user, add a prompt for assistant
-        if messages and messages[-1].role != "user":
-            prompt += "\n\nHuman: Please continue."
+    @staticmethod
+    def apply_json_mode(system_prompt: Optional[str]) -> str:
+        """
+        Prepend JSON_MODE_INSTRUCTION to the system prompt.
 
-        return prompt, system_prompt
+        Memoized on the prompt value; oversized prompts bypass the cache
+        so it never pins large strings.
+        """
+        if system_prompt and len(system_prompt) > _EXTRACT_CACHE_MAX_LEN:
+            return f"{MessageAdapter.JSON_MODE_INSTRUCTION}\n\n{system_prompt}"
+        return _apply_json_mode_cached(system_prompt)
 
     @staticmethod
     def filter_content(content: str) -> str:
@@ -696,30 +1003,41 @@ class MessageAdapter:
         if len(content) > _MAX_FILTER_LENGTH:
             return content
 
-        # Remove thinking blocks (common when tools are disabled but Claude tries to think)
-        content = _strip_tag_blocks(content, "thinking")
-
-        # Extract content from attempt_completion blocks (these contain the actual user response)
-        attempt_inner = _extract_first_block(content, "attempt_completion")
-        if attempt_inner is not None:
-            extracted_content = attempt_inner.strip()
-
-            # If there's a <result> tag inside, extract from that
-            result_inner = _extract_first_block(extracted_content, "result")
-            if result_inner is not None:
-                extracted_content = result_inner.strip()
-
-            if extracted_content:
-                content = extracted_content
-        else:
-            # Remove other tool usage blocks (when tools are disabled but Claude tries to use them)
-            for tag in _TOOL_TAGS:
-                content = _strip_tag_blocks(content, tag)
-
-        content = _IMAGE_RE.sub("[Image: Content not supported by Claude Code]", content)
+        # Every tag handled below starts with "<", so one SIMD substring
+        # check skips the whole tag-processing stage for the common case of
+        # a clean response with no markup at all.
+        if "<" in content:
+            # Remove thinking blocks (common when tools are disabled but Claude tries to think)
+            content = _strip_tag_blocks(content, "thinking")
+
+            # Extract content from attempt_completion blocks (these contain the actual user response)
+            attempt_inner = _extract_first_block(content, "attempt_completion")
+            if attempt_inner is not None:
+                extracted_content = attempt_inner.strip()
+
+                # If there's a <result> tag inside, extract from that
+                result_inner = _extract_first_block(extracted_content, "result")
+                if result_inner is not None:
+                    extracted_content = result_inner.strip()
+
+                if extracted_content:
+                    content = extracted_content
+            else:
+                # Remove other tool usage blocks (when tools are disabled but
+                # Claude tries to use them). One pass finds which tags occur;
+                # stripping then runs only for those, in the usual order.
+                present = _present_tool_tags(content)
+                for tag in _TOOL_TAGS:
+                    if tag in present:
+                        content = _strip_tag_blocks(content, tag)
+
+        # Same idea for image references: only invoke the regex when one of
+        # its two literal prefixes is actually present.
+        if "[Image:" in content or "data:image/" in content:
+            content = _IMAGE_RE.sub("[Image: Content not supported by Claude Code]", content)
 
         # Clean up extra whitespace and newlines
-        content = _MULTI_NEWLINE_RE.sub("\n\n", content)
+        content = _collapse_newline_runs(content)
         content = content.strip()
 
         # If content is now empty or only whitespace, provide a fallback
@@ -746,4 +1064,5 @@ class MessageAdapter:
         Rough estimation of token count.
         OpenAI's rule of thumb: ~4 characters per token for English text.
         """
-        return len(text) // 4
+        # len() is O(1); the shift is the cheapest divide-by-4 available.
+        return len(text) >> 2
@@ -9,10 +9,11 @@ This service provides:
 - Auth method awareness (only fetches from API for 'anthropic' auth)
 """
 
+import asyncio
 import os
 import time
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 
 import httpx
 
@@ -26,25 +27,58 @@ ANTHROPIC_API_BASE = "https://api.anthropic.com"
 ANTHROPIC_API_VERSION = "2023-06-01"
 MODEL_FETCH_TIMEOUT = 10.0  # seconds
 
+# The models endpoint never changes; build the URL once at import.
+_MODELS_URL = f"{ANTHROPIC_API_BASE}/v1/models"
+
+# Keep a few connections alive so refresh_models() reuses the TLS session
+# established at startup instead of reconnecting each time.
+_CLIENT_LIMITS = httpx.Limits(
+    max_keepalive_connections=4, max_connections=10, keepalive_expiry=30.0
+)
+
+
+# Shared fallback list, built once; get_models() returns it directly rather
+# than copying CLAUDE_MODELS on every /v1/models request. Callers treat the
+# result as read-only.
+_FALLBACK_MODELS: List[str] = list(CLAUDE_MODELS)
+
+
+def _make_client() -> httpx.AsyncClient:
+    """Build the shared AsyncClient with the service's timeout and pool limits."""
+    return httpx.AsyncClient(timeout=MODEL_FETCH_TIMEOUT, limits=_CLIENT_LIMITS)
+
 
 class ModelService:
     """Fetches models from Anthropic API with fallback to constants."""
 
     def __init__(self):
-        self._cached_models: Optional[List[str]] = None
+        self._cached_models: Optional[Sequence[str]] = None
         self._http_client: Optional[httpx.AsyncClient] = None
         self._initialized: bool = False
         self._last_refresh: Optional[float] = None
         self._source: str = "fallback"  # "api" or "fallback"
+        self._fetch_task: Optional["asyncio.Task"] = None
 
     async def initialize(self) -> None:
-        """Called during app startup - fetch models from API."""
+        """Called during app startup - start the model fetch without blocking.
+
+        The service becomes usable immediately, serving the static fallback
+        list; the API fetch runs as a background task and swaps the cached
+        models in when it lands, so a slow or unreachable API never delays
+        startup by MODEL_FETCH_TIMEOUT.
+        """
         if self._initialized:
             return
 
-        self._http_client = httpx.AsyncClient(timeout=MODEL_FETCH_TIMEOUT)
+        self._http_client = _make_client()
+        self._cached_models = None
+        self._source = "fallback"
+        self._initialized = True
+
+        self._fetch_task = asyncio.create_task(self._apply_startup_fetch())
 
-        # Attempt to fetch models from API
+    async def _apply_startup_fetch(self) -> None:
+        """Run the startup API fetch and publish the result."""
         fetched_models = await self.fetch_models_from_api()
 
         if fetched_models:
@@ -53,14 +87,19 @@ class ModelService:
             self._last_refresh = time.time()
             logger.info(f"Successfully fetched {len(fetched_models)} models from Anthropic API")
         else:
-            self._cached_models = None
-            self._source = "fallback"
             logger.info("Using fallback static model list from constants")
 
-        self._initialized = True
+    async def wait_until_ready(self) -> None:
+        """Await the startup fetch, if one is still in flight."""
+        if self._fetch_task is not None:
+            await self._fetch_task
 
     async def shutdown(self) -> None:
         """Close HTTP client on app shutdown."""
+        if self._fetch_task is not None:
+            if not self._fetch_task.done():
+                self._fetch_task.cancel()
+            self._fetch_task = None
         if self._http_client:
             await self._http_client.aclose()
             self._http_client = None
@@ -69,7 +108,7 @@ class ModelService:
         self._last_refresh = None
         self._source = "fallback"
 
-    async def fetch_models_from_api(self) -> Optional[List[str]]:
+    async def fetch_models_from_api(self) -> Optional[Tuple[str, ...]]:
         """
         Fetch models based on configured auth method.
 
@@ -106,7 +145,7 @@ class ModelService:
         logger.debug(f"Unknown auth method '{auth_method}', using fallback")
         return None
 
-    async def _fetch_with_api_key(self, api_key: str) -> Optional[List[str]]:
+    async def _fetch_with_api_key(self, api_key: str) -> Optional[Tuple[str, ...]]:
         """
         Fetch models from Anthropic API using API key.
 
@@ -118,11 +157,11 @@ class ModelService:
         Returns list of model IDs on success, None on failure.
         """
         if not self._http_client:
-            self._http_client = httpx.AsyncClient(timeout=MODEL_FETCH_TIMEOUT)
+            self._http_client = _make_client()
 
         try:
             response = await self._http_client.get(
-                f"{ANTHROPIC_API_BASE}/v1/models",
+                _MODELS_URL,
                 headers={
                     "x-api-key": api_key,
                     "anthropic-version": ANTHROPIC_API_VERSION,
@@ -131,13 +170,12 @@ class ModelService:
 
             if response.status_code == 200:
                 data = response.json()
-                # Extract model IDs from the response
+                # Extract model IDs from the response; a tuple keeps the
+                # cached collection immutable and a little smaller.
                 # API returns {"data": [{"id": "claude-...", ...}, ...]}
-                models = []
-                for model_data in data.get("data", []):
-                    model_id = model_data.get("id")
-                    if model_id:
-                        models.append(model_id)
+                models = tuple(
+                    model_data["id"] for model_data in data.get("data", []) if model_data.get("id")
+                )
 
                 if models:
                     logger.debug(f"Fetched models from API: {models}")
@@ -170,11 +208,15 @@ class ModelService:
             logger.warning(f"Unexpected error fetching models: {e}")
             return None
 
-    def get_models(self) -> List[str]:
-        """Return cached models or CLAUDE_MODELS fallback."""
+    def get_models(self) -> Sequence[str]:
+        """Return cached models or the CLAUDE_MODELS fallback.
+
+        The returned sequence is shared, not a copy; callers must not
+        mutate it.
+        """
         if self._cached_models:
             return self._cached_models
-        return list(CLAUDE_MODELS)
+        return _FALLBACK_MODELS
 
     def is_initialized(self) -> bool:
         """Check if service has been initialized."""
@@ -6,26 +6,53 @@ and improve response times for repeated queries.
 """
 
 import hashlib
+import heapq
 import json
 import os
 import threading
 import time
 import logging
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, Optional
 from collections import OrderedDict
 
+try:
+    # Optional fast path (same pattern as message_adapter): orjson
+    # serializes straight to bytes, skipping the str build + encode that
+    # stdlib json needs on every cache-key computation.
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+if _orjson is not None:
+
+    def _canonical_bytes(fields: Dict[str, Any]) -> bytes:
+        return _orjson.dumps(fields, option=_orjson.OPT_SORT_KEYS, default=str)
+
+else:
+
+    def _canonical_bytes(fields: Dict[str, Any]) -> bytes:
+        return json.dumps(fields, sort_keys=True, default=str).encode()
+
+
 logger = logging.getLogger(__name__)
 
+# Sentinel distinguishing "absent" from any cached entry in single-lookup gets.
+_MISSING = object()
+
 
-@dataclass
+@dataclass(slots=True)
 class CacheEntry:
-    """A cached response with metadata."""
+    """A cached response with metadata.
+
+    Per-entry hit counters were dropped: aggregate hits already live in
+    the cache-wide stats, and the per-hit write to each entry was the
+    only mutation on the hottest path.
+    """
 
     response: Dict[str, Any]
     created_at: float
     expires_at: float
-    hit_count: int = 0
 
 
 class RequestCache:
@@ -44,6 +71,7 @@ class RequestCache:
         enabled: bool = True,
         max_size: int = 100,
         ttl_seconds: int = 60,
+        clock: Callable[[], float] = time.monotonic,
     ):
         """
         Initialize the request cache.
@@ -52,25 +80,34 @@ class RequestCache:
             enabled: Whether caching is enabled
             max_size: Maximum number of entries to store
             ttl_seconds: Time-to-live for cache entries in seconds
+            clock: Monotonic time source; injectable so tests can advance
+                time without real sleeps
         """
         self._enabled = enabled
+        self._clock = clock
         self._max_size = max_size
         self._ttl_seconds = ttl_seconds
-        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
-        self._lock = threading.RLock()
-        self._stats = {
-            "hits": 0,
-            "misses": 0,
-            "evictions": 0,
-            "expirations": 0,
-        }
+        self._cache: OrderedDict[bytes, CacheEntry] = OrderedDict()
+        # Min-heap of (expires_at, key) driving cleanup_expired. Entries
+        # are never removed from the heap eagerly; stale ones (key gone or
+        # re-set with a later expiry) are skipped when popped.
+        self._expiry_heap: list = []
+        # Plain Lock, not RLock: no method acquires while already holding
+        # it, so paying for re-entrancy tracking on every get/set is waste.
+        self._lock = threading.Lock()
+        # Counters live as plain int attributes: incrementing them is an
+        # attribute store instead of a dict lookup on every operation.
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
 
     @property
     def enabled(self) -> bool:
         """Check if caching is enabled."""
         return self._enabled
 
-    def _compute_hash(self, request_data: Dict[str, Any]) -> str:
+    def _compute_hash(self, request_data: Dict[str, Any]) -> bytes:
         """
         Compute a deterministic hash for a request.
 
@@ -90,23 +127,48 @@ class RequestCache:
             request_data: The request dictionary
 
         Returns:
-            A hex string hash of the request
+            A 16-byte digest of the request
         """
+        # Messages are projected down to role and content: tool-call ids,
+        # names and other metadata never reach the prompt, so hashing them
+        # would only bloat the canonicalized payload for long histories.
+        messages = request_data.get("messages")
+        if messages:
+            messages = [(m.get("role"), m.get("content")) for m in messages]
+
         # Extract only the fields that affect the response
         hashable_fields = {
             "model": request_data.get("model"),
-            "messages": request_data.get("messages"),
+            "messages": messages,
             "temperature": request_data.get("temperature"),
             "max_tokens": request_data.get("max_tokens"),
             "response_format": request_data.get("response_format"),
             "top_p": request_data.get("top_p"),
         }
 
-        # Convert to a stable JSON string (sorted keys)
-        json_str = json.dumps(hashable_fields, sort_keys=True, default=str)
+        # Keys are process-local and non-cryptographic, so BLAKE2b (the
+        # fastest hash in hashlib) with a 128-bit digest is plenty; SHA-256
+        # was pure overhead here. _canonical_bytes gives a stable
+        # sorted-key serialization directly as bytes, and the raw digest is
+        # kept as the key: dict operations hash 16 bytes instead of a
+        # 64-char hex string (keys are hex-encoded only for log lines).
+        return hashlib.blake2b(_canonical_bytes(hashable_fields), digest_size=16).digest()
+
+    def compute_key(self, request_data: Dict[str, Any]) -> bytes:
+        """
+        Compute the cache key for a request.
+
+        Callers that need both a lookup and a later insertion (the normal
+        miss-then-store flow) can compute the key once and use the
+        ``*_by_key`` variants to avoid hashing the request twice.
 
-        # Compute SHA-256 hash
-        return hashlib.sha256(json_str.encode()).hexdigest()
+        Args:
+            request_data: The request dictionary
+
+        Returns:
+            An opaque bytes key for the request
+        """
+        return self._compute_hash(request_data)
 
     def get(self, request_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -115,36 +177,48 @@ class RequestCache:
         Args:
             request_data: The request dictionary
 
+        Returns:
+            Cached response if found and not expired, None otherwise
+        """
+        if not self._enabled:
+            return None
+        return self.get_by_key(self._compute_hash(request_data))
+
+    def get_by_key(self, cache_key: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached response by a key from :meth:`compute_key`.
+
+        Args:
+            cache_key: Precomputed request key
+
         Returns:
             Cached response if found and not expired, None otherwise
         """
         if not self._enabled:
             return None
 
-        cache_key = self._compute_hash(request_data)
-        current_time = time.time()
+        current_time = self._clock()
 
         with self._lock:
-            if cache_key not in self._cache:
-                self._stats["misses"] += 1
+            # Single lookup instead of a membership test plus an indexing.
+            entry = self._cache.get(cache_key, _MISSING)
+            if entry is _MISSING:
+                self._misses += 1
                 return None
 
-            entry = self._cache[cache_key]
-
             # Check if expired
             if current_time > entry.expires_at:
                 del self._cache[cache_key]
-                self._stats["expirations"] += 1
-                self._stats["misses"] += 1
-                logger.debug(f"Cache entry expired for key {cache_key[:16]}...")
+                self._expirations += 1
+                self._misses += 1
+                logger.debug("Cache entry expired for key %s...", cache_key.hex())
                 return None
 
             # Move to end (most recently used)
             self._cache.move_to_end(cache_key)
-            entry.hit_count += 1
-            self._stats["hits"] += 1
+            self._hits += 1
 
-            logger.debug(f"Cache hit for key {cache_key[:16]}... (hit_count={entry.hit_count})")
+            logger.debug("Cache hit for key %s...", cache_key.hex())
             return entry.response
 
     def set(self, request_data: Dict[str, Any], response: Dict[str, Any]) -> None:
@@ -157,26 +231,48 @@ class RequestCache:
         """
         if not self._enabled:
             return
+        self.set_by_key(self._compute_hash(request_data), response)
 
-        cache_key = self._compute_hash(request_data)
-        current_time = time.time()
+    def set_by_key(self, cache_key: bytes, response: Dict[str, Any]) -> None:
+        """
+        Cache a response under a key from :meth:`compute_key`.
+
+        Args:
+            cache_key: Precomputed request key
+            response: The response to cache
+        """
+        if not self._enabled:
+            return
+
+        current_time = self._clock()
 
         with self._lock:
+            # Purge a few stale entries first so expired ones free their
+            # slot instead of forcing an LRU eviction of a live entry.
+            self._purge_expired_locked(current_time, max_pops=3)
+
+            # Drop any existing entry first so the re-set below lands at the
+            # MRU end (plain assignment keeps an existing key's old slot).
+            self._cache.pop(cache_key, None)
+
             # Evict if at capacity
             while len(self._cache) >= self._max_size:
-                oldest_key = next(iter(self._cache))
-                del self._cache[oldest_key]
-                self._stats["evictions"] += 1
-                logger.debug(f"Evicted oldest cache entry {oldest_key[:16]}...")
+                oldest_key, _ = self._cache.popitem(last=False)
+                self._evictions += 1
+                logger.debug("Evicted oldest cache entry %s...", oldest_key.hex())
 
             # Add new entry
+            expires_at = current_time + self._ttl_seconds
             self._cache[cache_key] = CacheEntry(
                 response=response,
                 created_at=current_time,
-                expires_at=current_time + self._ttl_seconds,
+                expires_at=expires_at,
             )
+            heapq.heappush(self._expiry_heap, (expires_at, cache_key))
 
-            logger.debug(f"Cached response for key {cache_key[:16]}... (ttl={self._ttl_seconds}s)")
+            logger.debug(
+                "Cached response for key %s... (ttl=%ss)", cache_key.hex(), self._ttl_seconds
+            )
 
     def clear(self) -> int:
         """
@@ -188,6 +284,7 @@ class RequestCache:
         with self._lock:
             count = len(self._cache)
             self._cache.clear()
+            self._expiry_heap.clear()
             logger.info(f"Cleared {count} cache entries")
             return count
 
@@ -199,21 +296,51 @@ class RequestCache:
             Dictionary with cache stats
         """
         with self._lock:
-            total_requests = self._stats["hits"] + self._stats["misses"]
-            hit_rate = (self._stats["hits"] / total_requests * 100) if total_requests > 0 else 0
+            total_requests = self._hits + self._misses
+            hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0
 
             return {
                 "enabled": self._enabled,
                 "max_size": self._max_size,
                 "ttl_seconds": self._ttl_seconds,
                 "current_size": len(self._cache),
-                "hits": self._stats["hits"],
-                "misses": self._stats["misses"],
+                "hits": self._hits,
+                "misses": self._misses,
                 "hit_rate_percent": round(hit_rate, 2),
-                "evictions": self._stats["evictions"],
-                "expirations": self._stats["expirations"],
+                "evictions": self._evictions,
+                "expirations": self._expirations,
             }
 
+    def _purge_expired_locked(self, current_time: float, max_pops: Optional[int] = None) -> int:
+        """
+        Pop expired entries off the heap; the caller must hold the lock.
+
+        Args:
+            current_time: Monotonic timestamp to compare deadlines against
+            max_pops: Bound on heap pops (stale ones included), or None
+                for an unbounded sweep
+
+        Returns:
+            Number of cache entries removed
+        """
+        removed = 0
+        pops = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] < current_time:
+            if max_pops is not None and pops >= max_pops:
+                break
+            _, key = heapq.heappop(heap)
+            pops += 1
+            entry = self._cache.get(key)
+            # Skip stale heap entries: the key was already evicted,
+            # expired via get(), or re-set with a later expiry.
+            if entry is None or current_time <= entry.expires_at:
+                continue
+            del self._cache[key]
+            removed += 1
+            self._expirations += 1
+        return removed
+
     def cleanup_expired(self) -> int:
         """
         Remove all expired entries.
@@ -221,28 +348,42 @@ class RequestCache:
         Returns:
             Number of entries removed
         """
-        current_time = time.time()
-        removed = 0
+        current_time = self._clock()
 
         with self._lock:
-            expired_keys = [
-                key for key, entry in self._cache.items() if current_time > entry.expires_at
-            ]
-
-            for key in expired_keys:
-                del self._cache[key]
-                removed += 1
-                self._stats["expirations"] += 1
+            removed = self._purge_expired_locked(current_time)
 
         if removed > 0:
-            logger.debug(f"Cleaned up {removed} expired cache entries")
+            logger.debug("Cleaned up %s expired cache entries", removed)
 
         return removed
 
 
-# Global cache instance with configuration from environment
-request_cache = RequestCache(
-    enabled=os.getenv("REQUEST_CACHE_ENABLED", "false").lower() in ("true", "1", "yes", "on"),
-    max_size=int(os.getenv("REQUEST_CACHE_MAX_SIZE", "100")),
-    ttl_seconds=int(os.getenv("REQUEST_CACHE_TTL_SECONDS", "60")),
-)
+# Global cache instance, created lazily so the environment is read when the
+# cache is first used rather than at import time (tests and forked workers
+# can adjust REQUEST_CACHE_* before first touch).
+_request_cache: Optional[RequestCache] = None
+_request_cache_init_lock = threading.Lock()
+
+
+def get_request_cache() -> RequestCache:
+    """Return the process-wide cache, building it from the environment on first use."""
+    global _request_cache
+    if _request_cache is None:
+        with _request_cache_init_lock:
+            if _request_cache is None:
+                _request_cache = RequestCache(
+                    enabled=os.getenv("REQUEST_CACHE_ENABLED", "false").lower()
+                    in ("true", "1", "yes", "on"),
+                    max_size=int(os.getenv("REQUEST_CACHE_MAX_SIZE", "100")),
+                    ttl_seconds=int(os.getenv("REQUEST_CACHE_TTL_SECONDS", "60")),
+                )
+    return _request_cache
+
+
+def __getattr__(name: str):
+    # Keep ``from src.request_cache import request_cache`` working for
+    # existing importers while deferring construction to first access.
+    if name == "request_cache":
+        return get_request_cache()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -95,6 +95,11 @@ That's all!"""
         result = MessageAdapter.extract_json("")
         assert result is None
 
+    def test_extract_json_whitespace_only(self):
+        """Returns None for whitespace-only content."""
+        result = MessageAdapter.extract_json("\n\n")
+        assert result is None
+
     def test_extract_json_none_input(self):
         """Returns None for None input."""
         result = MessageAdapter.extract_json(None)
@@ -373,6 +378,12 @@ class TestBalancedJsonExtraction:
         assert result is not None
         assert '"array": [1, 2, 3]' in result
 
+    def test_valid_candidate_inside_invalid_span(self):
+        """Finds valid JSON nested inside an invalid balanced span."""
+        content = '{count: 3, items: [1, 2, 3], tags: ["a", "b"]}'
+        result = MessageAdapter.extract_json(content)
+        assert result == "[1, 2, 3]"
+
     def test_preamble_stripping(self):
         """Removes common Claude preambles before JSON."""
         content = 'Here\'s the JSON: {"key": "value"}'
@@ -449,6 +460,13 @@ class TestJsonExtractionMetadata:
         assert result.method == "failed"
         assert result.original_length == 0
 
+    def test_whitespace_only_content(self):
+        """Handles content that strips down to nothing."""
+        result = MessageAdapter.extract_json_with_metadata("  ")
+        assert result.success is False
+        assert result.method == "failed"
+        assert result.content is None
+
 
 class TestEnforceJsonFormatWithMetadata:
     """Test enforce_json_format_with_metadata method."""
@@ -502,9 +520,9 @@ class TestCommonPreambles:
         """COMMON_PREAMBLES constant exists."""
         assert hasattr(MessageAdapter, "COMMON_PREAMBLES")
 
-    def test_common_preambles_is_list(self):
-        """COMMON_PREAMBLES is a list."""
-        assert isinstance(MessageAdapter.COMMON_PREAMBLES, list)
+    def test_common_preambles_is_sequence(self):
+        """COMMON_PREAMBLES is an immutable sequence."""
+        assert isinstance(MessageAdapter.COMMON_PREAMBLES, (list, tuple))
 
     def test_common_preambles_not_empty(self):
         """COMMON_PREAMBLES is not empty."""
@@ -230,6 +230,12 @@ class TestFilterContent:
         assert "base64" not in result
         assert "iVBORw0" not in result
 
+    def test_collapses_unicode_padded_newlines(self):
+        """Blank lines padded with Unicode whitespace still collapse."""
+        content = "a\n\xa0\n\xa0\nb"
+        result = MessageAdapter.filter_content(content)
+        assert result == "a\n\nb"
+
     def test_collapses_multiple_newlines(self):
         """Multiple consecutive newlines are collapsed."""
         content = "Line 1\n\n\n\n\nLine 2"
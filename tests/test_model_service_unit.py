@@ -7,14 +7,38 @@ with graceful fallback to static constants. Includes tests for
 different authentication methods (anthropic, cli, bedrock, vertex).
 """
 
-import time
 import pytest
-from unittest.mock import patch, AsyncMock, MagicMock, PropertyMock
+from unittest.mock import patch, AsyncMock
 import httpx
 
-from src.model_service import ModelService, MODEL_FETCH_TIMEOUT
+from src.model_service import ModelService
 from src.constants import CLAUDE_MODELS
 
+# Expected fallback list, built once instead of per-assert.
+_CLAUDE_MODELS_LIST = list(CLAUDE_MODELS)
+
+
+def _mock_client(handler):
+    """Real AsyncClient over httpx.MockTransport - no mock attribute dispatch."""
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class _StubbedFetchService(ModelService):
+    """ModelService with the API fetch stubbed out - no mock machinery involved.
+
+    Tests assign fetch_result (and read fetch_calls) instead of rebinding
+    fetch_models_from_api through patch.object/AsyncMock each time.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.fetch_result = None
+        self.fetch_calls = 0
+
+    async def fetch_models_from_api(self):
+        self.fetch_calls += 1
+        return self.fetch_result
+
 
 class TestModelService:
     """Test ModelService class."""
@@ -24,119 +48,113 @@ class TestModelService:
         """Create a fresh ModelService instance for each test."""
         return ModelService()
 
-    @pytest.mark.asyncio
-    async def test_fetch_models_success(self, model_service):
-        """Successfully fetches models from API with anthropic auth."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "data": [
-                {"id": "claude-sonnet-4-5-20250929", "name": "Claude Sonnet"},
-                {"id": "claude-haiku-4-5-20251001", "name": "Claude Haiku"},
-            ]
-        }
-
+    @pytest.fixture
+    def anthropic_env(self, monkeypatch):
+        """Patch anthropic auth with an API key set - shared by the fetch tests."""
+        # monkeypatch.setenv records just the one delta; patch.dict would
+        # snapshot and restore the whole environment per test.
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         with patch("src.model_service.auth_manager") as mock_auth:
             mock_auth.auth_method = "anthropic"
-            with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test-key"}):
-                with patch.object(model_service, "_http_client") as mock_client:
-                    mock_client.get = AsyncMock(return_value=mock_response)
+            yield mock_auth
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_fetch_models_success(self, model_service, anthropic_env):
+        """Successfully fetches models from API with anthropic auth."""
+
+        def handler(request):
+            return httpx.Response(
+                200,
+                json={
+                    "data": [
+                        {"id": "claude-sonnet-4-5-20250929", "name": "Claude Sonnet"},
+                        {"id": "claude-haiku-4-5-20251001", "name": "Claude Haiku"},
+                    ]
+                },
+            )
 
-                    result = await model_service.fetch_models_from_api()
+        model_service._http_client = _mock_client(handler)
+
+        result = await model_service.fetch_models_from_api()
 
         assert result is not None
         assert len(result) == 2
         assert "claude-sonnet-4-5-20250929" in result
         assert "claude-haiku-4-5-20251001" in result
 
-    @pytest.mark.asyncio
-    async def test_fetch_models_timeout(self, model_service):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_fetch_models_timeout(self, model_service, anthropic_env):
         """Returns None on timeout, allowing fallback to constants."""
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "anthropic"
-            with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test-key"}):
-                with patch.object(model_service, "_http_client") as mock_client:
-                    mock_client.get = AsyncMock(side_effect=httpx.TimeoutException("timeout"))
 
-                    result = await model_service.fetch_models_from_api()
+        def handler(request):
+            raise httpx.TimeoutException("timeout")
+
+        model_service._http_client = _mock_client(handler)
+
+        result = await model_service.fetch_models_from_api()
 
         assert result is None
 
-    @pytest.mark.asyncio
-    async def test_fetch_models_auth_error(self, model_service):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_fetch_models_auth_error(self, model_service, anthropic_env):
         """Returns None on 401 auth error, allowing fallback."""
-        mock_response = MagicMock()
-        mock_response.status_code = 401
 
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "anthropic"
-            with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "invalid-key"}):
-                with patch.object(model_service, "_http_client") as mock_client:
-                    mock_client.get = AsyncMock(return_value=mock_response)
+        def handler(request):
+            return httpx.Response(401)
+
+        model_service._http_client = _mock_client(handler)
 
-                    result = await model_service.fetch_models_from_api()
+        result = await model_service.fetch_models_from_api()
 
         assert result is None
 
-    @pytest.mark.asyncio
-    async def test_fetch_models_rate_limited(self, model_service):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_fetch_models_rate_limited(self, model_service, anthropic_env):
         """Returns None on 429 rate limit, allowing fallback."""
-        mock_response = MagicMock()
-        mock_response.status_code = 429
 
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "anthropic"
-            with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test-key"}):
-                with patch.object(model_service, "_http_client") as mock_client:
-                    mock_client.get = AsyncMock(return_value=mock_response)
+        def handler(request):
+            return httpx.Response(429)
 
-                    result = await model_service.fetch_models_from_api()
+        model_service._http_client = _mock_client(handler)
+
+        result = await model_service.fetch_models_from_api()
 
         assert result is None
 
-    @pytest.mark.asyncio
-    async def test_fetch_models_network_error(self, model_service):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_fetch_models_network_error(self, model_service, anthropic_env):
         """Returns None on network error, allowing fallback."""
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "anthropic"
-            with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test-key"}):
-                with patch.object(model_service, "_http_client") as mock_client:
-                    mock_client.get = AsyncMock(side_effect=httpx.RequestError("connection failed"))
 
-                    result = await model_service.fetch_models_from_api()
+        def handler(request):
+            raise httpx.RequestError("connection failed")
+
+        model_service._http_client = _mock_client(handler)
+
+        result = await model_service.fetch_models_from_api()
 
         assert result is None
 
-    @pytest.mark.asyncio
-    async def test_fetch_models_no_api_key(self, model_service):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_fetch_models_no_api_key(self, model_service, monkeypatch):
         """Returns None when no API key is set (anthropic auth)."""
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
         with patch("src.model_service.auth_manager") as mock_auth:
             mock_auth.auth_method = "anthropic"
-            with patch.dict("os.environ", {}, clear=True):
-                # Ensure ANTHROPIC_API_KEY is not set
-                import os
-
-                if "ANTHROPIC_API_KEY" in os.environ:
-                    del os.environ["ANTHROPIC_API_KEY"]
 
-                result = await model_service.fetch_models_from_api()
+            result = await model_service.fetch_models_from_api()
 
         assert result is None
 
-    @pytest.mark.asyncio
-    async def test_fetch_models_empty_response(self, model_service):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_fetch_models_empty_response(self, model_service, anthropic_env):
         """Returns None when API returns empty model list."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"data": []}
 
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "anthropic"
-            with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test-key"}):
-                with patch.object(model_service, "_http_client") as mock_client:
-                    mock_client.get = AsyncMock(return_value=mock_response)
+        def handler(request):
+            return httpx.Response(200, json={"data": []})
+
+        model_service._http_client = _mock_client(handler)
 
-                    result = await model_service.fetch_models_from_api()
+        result = await model_service.fetch_models_from_api()
 
         assert result is None
 
@@ -154,7 +172,7 @@ class TestModelService:
 
         result = model_service.get_models()
 
-        assert result == list(CLAUDE_MODELS)
+        assert result == _CLAUDE_MODELS_LIST
 
     def test_get_models_returns_fallback_empty_cache(self, model_service):
         """Returns CLAUDE_MODELS fallback when cache is empty list."""
@@ -164,46 +182,48 @@ class TestModelService:
         result = model_service.get_models()
 
         # Empty list is falsy, so fallback is used
-        assert result == list(CLAUDE_MODELS)
+        assert result == _CLAUDE_MODELS_LIST
 
     def test_is_initialized_false_by_default(self, model_service):
         """Service is not initialized by default."""
         assert model_service.is_initialized() is False
 
-    @pytest.mark.asyncio
-    async def test_initialize_sets_initialized(self, model_service):
-        """Initialize sets initialized flag."""
-        with patch.object(model_service, "fetch_models_from_api", new_callable=AsyncMock) as mock:
-            mock.return_value = None
+    @pytest.fixture
+    def stub_service(self):
+        """Service whose fetch is a plain stub, for initialize tests."""
+        return _StubbedFetchService()
 
-            await model_service.initialize()
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_initialize_sets_initialized(self, stub_service):
+        """Initialize sets initialized flag."""
+        await stub_service.initialize()
 
-        assert model_service.is_initialized() is True
+        assert stub_service.is_initialized() is True
 
-    @pytest.mark.asyncio
-    async def test_initialize_caches_fetched_models(self, model_service):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_initialize_caches_fetched_models(self, stub_service):
         """Initialize caches successfully fetched models."""
         fetched = ["claude-3-opus", "claude-3-sonnet"]
+        stub_service.fetch_result = fetched
 
-        with patch.object(model_service, "fetch_models_from_api", new_callable=AsyncMock) as mock:
-            mock.return_value = fetched
-
-            await model_service.initialize()
+        await stub_service.initialize()
+        await stub_service.wait_until_ready()
 
-        assert model_service._cached_models == fetched
+        assert stub_service._cached_models == fetched
 
-    @pytest.mark.asyncio
-    async def test_initialize_only_once(self, model_service):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_initialize_only_once(self, stub_service):
         """Initialize only fetches models once."""
-        with patch.object(model_service, "fetch_models_from_api", new_callable=AsyncMock) as mock:
-            mock.return_value = ["model-1"]
+        stub_service.fetch_result = ["model-1"]
 
-            await model_service.initialize()
-            await model_service.initialize()  # Second call should be no-op
+        await stub_service.initialize()
+        await stub_service.wait_until_ready()
+        await stub_service.initialize()  # Second call should be no-op
+        await stub_service.wait_until_ready()
 
-        mock.assert_called_once()
+        assert stub_service.fetch_calls == 1
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_shutdown_closes_client(self, model_service):
         """Shutdown closes the HTTP client."""
         mock_client = AsyncMock()
@@ -216,7 +236,7 @@ class TestModelService:
         assert model_service._http_client is None
         assert model_service._initialized is False
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_shutdown_safe_when_not_initialized(self, model_service):
         """Shutdown is safe when called before initialization."""
         # Should not raise
@@ -228,46 +248,44 @@ class TestModelService:
 class TestModelServiceIntegration:
     """Integration-style tests for ModelService."""
 
-    @pytest.mark.asyncio
-    async def test_full_lifecycle(self):
-        """Test full initialize-use-shutdown lifecycle."""
-        service = ModelService()
+    @pytest.fixture
+    def service(self):
+        """Create a fresh stub-fetch service, matching the other classes' fixtures."""
+        return _StubbedFetchService()
 
-        # Mock the API call
-        with patch.object(service, "fetch_models_from_api", new_callable=AsyncMock) as mock:
-            mock.return_value = ["test-model-1", "test-model-2"]
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_full_lifecycle(self, service):
+        """Test full initialize-use-shutdown lifecycle."""
+        service.fetch_result = ["test-model-1", "test-model-2"]
 
-            # Initialize
-            await service.initialize()
-            assert service.is_initialized()
+        # Initialize
+        await service.initialize()
+        await service.wait_until_ready()
+        assert service.is_initialized()
 
-            # Use
-            models = service.get_models()
-            assert models == ["test-model-1", "test-model-2"]
+        # Use
+        models = service.get_models()
+        assert models == ["test-model-1", "test-model-2"]
 
-            # Shutdown
-            await service.shutdown()
-            assert not service.is_initialized()
+        # Shutdown
+        await service.shutdown()
+        assert not service.is_initialized()
 
-            # After shutdown, should return fallback
-            models = service.get_models()
-            assert models == list(CLAUDE_MODELS)
+        # After shutdown, should return fallback
+        models = service.get_models()
+        assert models == _CLAUDE_MODELS_LIST
 
-    @pytest.mark.asyncio
-    async def test_fallback_on_api_failure(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_fallback_on_api_failure(self, service):
         """Test that API failure results in fallback models."""
-        service = ModelService()
-
-        # Mock API failure
-        with patch.object(service, "fetch_models_from_api", new_callable=AsyncMock) as mock:
-            mock.return_value = None  # API failed
+        # fetch_result defaults to None (API failed)
+        await service.initialize()
+        await service.wait_until_ready()
 
-            await service.initialize()
+        models = service.get_models()
+        assert models == _CLAUDE_MODELS_LIST
 
-            models = service.get_models()
-            assert models == list(CLAUDE_MODELS)
-
-            await service.shutdown()
+        await service.shutdown()
 
 
 class TestModelServiceRefresh:
@@ -275,11 +293,18 @@ class TestModelServiceRefresh:
 
     @pytest.fixture
     def model_service(self):
-        """Create a fresh ModelService instance for each test."""
-        return ModelService()
+        """Create a fresh stub-fetch service for each test."""
+        return _StubbedFetchService()
+
+    @pytest.fixture
+    def mock_auth(self):
+        """Patch auth_manager once per test; defaults to anthropic auth."""
+        with patch("src.model_service.auth_manager") as mock_auth:
+            mock_auth.auth_method = "anthropic"
+            yield mock_auth
 
-    @pytest.mark.asyncio
-    async def test_refresh_models_success(self, model_service):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_refresh_models_success(self, model_service, mock_auth):
         """Refresh successfully updates cached models with anthropic auth."""
         # First, initialize with some models
         model_service._cached_models = ["old-model-1", "old-model-2"]
@@ -288,14 +313,9 @@ class TestModelServiceRefresh:
 
         new_models = ["new-model-1", "new-model-2", "new-model-3"]
 
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "anthropic"
-            with patch.object(
-                model_service, "fetch_models_from_api", new_callable=AsyncMock
-            ) as mock:
-                mock.return_value = new_models
+        model_service.fetch_result = new_models
 
-                result = await model_service.refresh_models()
+        result = await model_service.refresh_models()
 
         assert result["success"] is True
         assert result["count"] == 3
@@ -306,22 +326,15 @@ class TestModelServiceRefresh:
         assert model_service._source == "api"
         assert model_service._last_refresh is not None
 
-    @pytest.mark.asyncio
-    async def test_refresh_models_failure_preserves_existing(self, model_service):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_refresh_models_failure_preserves_existing(self, model_service, mock_auth):
         """Refresh failure preserves existing cached models."""
         existing_models = ["existing-model-1", "existing-model-2"]
         model_service._cached_models = existing_models
         model_service._source = "api"
         model_service._initialized = True
 
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "anthropic"
-            with patch.object(
-                model_service, "fetch_models_from_api", new_callable=AsyncMock
-            ) as mock:
-                mock.return_value = None  # API failed
-
-                result = await model_service.refresh_models()
+        result = await model_service.refresh_models()  # fetch_result is None: API failed
 
         assert result["success"] is False
         assert "API fetch failed" in result["message"]
@@ -331,56 +344,36 @@ class TestModelServiceRefresh:
         # Existing models should be preserved
         assert model_service._cached_models == existing_models
 
-    @pytest.mark.asyncio
-    async def test_refresh_models_updates_last_refresh_time(self, model_service):
-        """Refresh updates the last_refresh timestamp."""
-        model_service._initialized = True
-
-        before_time = time.time()
-
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "anthropic"
-            with patch.object(
-                model_service, "fetch_models_from_api", new_callable=AsyncMock
-            ) as mock:
-                mock.return_value = ["model-1"]
-
-                await model_service.refresh_models()
-
-        after_time = time.time()
-
-        assert model_service._last_refresh is not None
-        assert before_time <= model_service._last_refresh <= after_time
-
-    @pytest.mark.asyncio
-    async def test_refresh_models_failure_does_not_update_timestamp(self, model_service):
-        """Refresh failure does not update last_refresh timestamp."""
+    @pytest.mark.asyncio(loop_scope="module")
+    @pytest.mark.parametrize(
+        "fetch_result,expected_refresh",
+        [
+            (["model-1"], 100.0),  # success stamps the pinned clock
+            (None, 1000.0),  # failure leaves the old timestamp alone
+        ],
+    )
+    async def test_refresh_models_timestamp_transition(
+        self, model_service, mock_auth, fetch_result, expected_refresh
+    ):
+        """Refresh updates last_refresh on success and preserves it on failure."""
         model_service._cached_models = ["model-1"]
         model_service._last_refresh = 1000.0  # Some old timestamp
         model_service._initialized = True
+        model_service.fetch_result = fetch_result
 
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "anthropic"
-            with patch.object(
-                model_service, "fetch_models_from_api", new_callable=AsyncMock
-            ) as mock:
-                mock.return_value = None
+        with patch("src.model_service.time.time", return_value=100.0):
+            await model_service.refresh_models()
 
-                await model_service.refresh_models()
+        assert model_service._last_refresh == expected_refresh
 
-        # Timestamp should remain unchanged
-        assert model_service._last_refresh == 1000.0
-
-    def test_get_status_returns_correct_info(self, model_service):
+    def test_get_status_returns_correct_info(self, model_service, mock_auth):
         """get_status returns correct service status including auth_method."""
         model_service._initialized = True
         model_service._source = "api"
         model_service._cached_models = ["model-1", "model-2", "model-3"]
         model_service._last_refresh = 1234567890.0
 
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "anthropic"
-            status = model_service.get_status()
+        status = model_service.get_status()
 
         assert status["initialized"] is True
         assert status["source"] == "api"
@@ -388,16 +381,16 @@ class TestModelServiceRefresh:
         assert status["last_refresh"] == 1234567890.0
         assert status["auth_method"] == "anthropic"
 
-    def test_get_status_fallback_source(self, model_service):
+    def test_get_status_fallback_source(self, model_service, mock_auth):
         """get_status shows fallback source when not from API."""
         model_service._initialized = True
         model_service._source = "fallback"
         model_service._cached_models = None
         model_service._last_refresh = None
 
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "claude_cli"
-            status = model_service.get_status()
+        mock_auth.auth_method = "claude_cli"
+
+        status = model_service.get_status()
 
         assert status["initialized"] is True
         assert status["source"] == "fallback"
@@ -405,29 +398,27 @@ class TestModelServiceRefresh:
         assert status["last_refresh"] is None
         assert status["auth_method"] == "claude_cli"
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_initialize_sets_source_api_on_success(self, model_service):
         """Initialize sets source to 'api' when fetch succeeds."""
-        with patch.object(model_service, "fetch_models_from_api", new_callable=AsyncMock) as mock:
-            mock.return_value = ["model-1", "model-2"]
+        model_service.fetch_result = ["model-1", "model-2"]
 
-            await model_service.initialize()
+        await model_service.initialize()
+        await model_service.wait_until_ready()
 
         assert model_service._source == "api"
         assert model_service._last_refresh is not None
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_initialize_sets_source_fallback_on_failure(self, model_service):
         """Initialize sets source to 'fallback' when fetch fails."""
-        with patch.object(model_service, "fetch_models_from_api", new_callable=AsyncMock) as mock:
-            mock.return_value = None
-
-            await model_service.initialize()
+        await model_service.initialize()  # fetch_result is None: fetch fails
+        await model_service.wait_until_ready()
 
         assert model_service._source == "fallback"
         assert model_service._last_refresh is None
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_shutdown_resets_source_and_timestamp(self, model_service):
         """Shutdown resets source and last_refresh."""
         model_service._source = "api"
@@ -448,126 +439,59 @@ class TestModelServiceAuthMethods:
         """Create a fresh ModelService instance for each test."""
         return ModelService()
 
-    @pytest.mark.asyncio
-    async def test_fetch_models_cli_auth_returns_none(self, model_service):
-        """CLI auth method returns None (uses static fallback)."""
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "claude_cli"
-
-            result = await model_service.fetch_models_from_api()
-
-        assert result is None
-
-    @pytest.mark.asyncio
-    async def test_fetch_models_bedrock_auth_returns_none(self, model_service):
-        """Bedrock auth method returns None (uses static fallback)."""
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "bedrock"
-
-            result = await model_service.fetch_models_from_api()
-
-        assert result is None
-
-    @pytest.mark.asyncio
-    async def test_fetch_models_vertex_auth_returns_none(self, model_service):
-        """Vertex auth method returns None (uses static fallback)."""
+    @pytest.fixture
+    def mock_auth(self):
+        """Patch auth_manager once per test; defaults to anthropic auth."""
         with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "vertex"
-
-            result = await model_service.fetch_models_from_api()
-
-        assert result is None
+            mock_auth.auth_method = "anthropic"
+            yield mock_auth
 
-    @pytest.mark.asyncio
-    async def test_fetch_models_unknown_auth_returns_none(self, model_service):
-        """Unknown auth method returns None (uses static fallback)."""
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "unknown_method"
+    @pytest.mark.asyncio(loop_scope="module")
+    @pytest.mark.parametrize("auth_method", ["claude_cli", "bedrock", "vertex", "unknown_method"])
+    async def test_fetch_models_non_anthropic_auth_returns_none(
+        self, model_service, mock_auth, auth_method
+    ):
+        """Non-anthropic auth methods return None (use static fallback)."""
+        mock_auth.auth_method = auth_method
 
-            result = await model_service.fetch_models_from_api()
+        result = await model_service.fetch_models_from_api()
 
         assert result is None
 
-    @pytest.mark.asyncio
-    async def test_refresh_models_cli_auth_fails(self, model_service):
-        """Refresh with CLI auth returns failure with auth_method in response."""
-        model_service._cached_models = ["model-1"]
+    @pytest.mark.asyncio(loop_scope="module")
+    @pytest.mark.parametrize(
+        "auth_method,cached_models,expected_count",
+        [
+            ("claude_cli", ["model-1"], 1),
+            ("bedrock", None, len(CLAUDE_MODELS)),
+            ("vertex", None, len(CLAUDE_MODELS)),
+        ],
+    )
+    async def test_refresh_models_non_anthropic_auth_fails(
+        self, model_service, mock_auth, auth_method, cached_models, expected_count
+    ):
+        """Refresh with non-anthropic auth returns failure with auth_method in response."""
+        model_service._cached_models = cached_models
         model_service._source = "fallback"
         model_service._initialized = True
 
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "claude_cli"
+        mock_auth.auth_method = auth_method
 
-            result = await model_service.refresh_models()
+        result = await model_service.refresh_models()
 
         assert result["success"] is False
         assert "Dynamic refresh requires ANTHROPIC_API_KEY" in result["message"]
-        assert result["auth_method"] == "claude_cli"
-        assert result["current_count"] == 1
+        assert result["auth_method"] == auth_method
+        assert result["current_count"] == expected_count
 
-    @pytest.mark.asyncio
-    async def test_refresh_models_bedrock_auth_fails(self, model_service):
-        """Refresh with Bedrock auth returns failure with auth_method in response."""
-        model_service._cached_models = None
-        model_service._source = "fallback"
+    @pytest.mark.parametrize("auth_method", ["claude_cli", "bedrock", "vertex"])
+    def test_get_status_includes_auth_method(self, model_service, mock_auth, auth_method):
+        """get_status reports the configured auth_method."""
         model_service._initialized = True
-
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "bedrock"
-
-            result = await model_service.refresh_models()
-
-        assert result["success"] is False
-        assert "Dynamic refresh requires ANTHROPIC_API_KEY" in result["message"]
-        assert result["auth_method"] == "bedrock"
-        assert result["current_count"] == len(CLAUDE_MODELS)
-
-    @pytest.mark.asyncio
-    async def test_refresh_models_vertex_auth_fails(self, model_service):
-        """Refresh with Vertex auth returns failure with auth_method in response."""
-        model_service._cached_models = None
         model_service._source = "fallback"
-        model_service._initialized = True
-
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "vertex"
-
-            result = await model_service.refresh_models()
 
-        assert result["success"] is False
-        assert "Dynamic refresh requires ANTHROPIC_API_KEY" in result["message"]
-        assert result["auth_method"] == "vertex"
-        assert result["current_count"] == len(CLAUDE_MODELS)
+        mock_auth.auth_method = auth_method
 
-    def test_get_status_includes_auth_method_cli(self, model_service):
-        """get_status includes auth_method for CLI auth."""
-        model_service._initialized = True
-        model_service._source = "fallback"
-
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "claude_cli"
-            status = model_service.get_status()
-
-        assert status["auth_method"] == "claude_cli"
-
-    def test_get_status_includes_auth_method_bedrock(self, model_service):
-        """get_status includes auth_method for Bedrock auth."""
-        model_service._initialized = True
-        model_service._source = "fallback"
-
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "bedrock"
-            status = model_service.get_status()
-
-        assert status["auth_method"] == "bedrock"
-
-    def test_get_status_includes_auth_method_vertex(self, model_service):
-        """get_status includes auth_method for Vertex auth."""
-        model_service._initialized = True
-        model_service._source = "fallback"
-
-        with patch("src.model_service.auth_manager") as mock_auth:
-            mock_auth.auth_method = "vertex"
-            status = model_service.get_status()
+        status = model_service.get_status()
 
-        assert status["auth_method"] == "vertex"
+        assert status["auth_method"] == auth_method
@@ -1,4 +1,4 @@
-"""Regression tests for the ReDoS hardening in ``message_adapter.filter_content``.
+"""Regression tests for the ReDoS hardening in ``message_adapter``.
 
 Each pathological input used to exhibit polynomial backtracking with the
 original lazy-``.*?`` regexes that CodeQL's py/polynomial-redos rule flagged
@@ -52,6 +52,26 @@ def test_filter_content_redos_inputs_are_linear(payload: str) -> None:
     )
 
 
+@pytest.mark.parametrize(
+    "payload",
+    [
+        "{" * 16000 + "}" * 16000,
+        "prose " + "{" * 8000 + "}" * 8000 + " prose",
+    ],
+    ids=["nested_brace_pyramid", "nested_brace_pyramid_in_prose"],
+)
+def test_extract_json_nested_pyramids_are_linear(payload: str) -> None:
+    """Balanced-but-invalid nesting must not provoke quadratic rescanning."""
+    start = time.perf_counter()
+    result = MessageAdapter.extract_json(payload)
+    elapsed = time.perf_counter() - start
+    assert result is None
+    assert elapsed < REDOS_BUDGET_SECONDS, (
+        f"extract_json took {elapsed:.3f}s on pathological input; "
+        f"expected < {REDOS_BUDGET_SECONDS}s"
+    )
+
+
 def test_filter_content_strips_thinking_block() -> None:
     out = MessageAdapter.filter_content("before<thinking>secret</thinking>after")
     assert "secret" not in out
@@ -7,8 +7,6 @@ and statistics tracking.
 """
 
 import pytest
-import time
-from unittest.mock import patch
 
 from src.request_cache import RequestCache, CacheEntry
 
@@ -49,7 +47,8 @@ class TestRequestCache:
 
     def test_cache_expiration(self):
         """Entries expire after TTL."""
-        cache = RequestCache(enabled=True, max_size=10, ttl_seconds=1)
+        fake_now = [1000.0]
+        cache = RequestCache(enabled=True, max_size=10, ttl_seconds=1, clock=lambda: fake_now[0])
         request = {"model": "test", "messages": [{"role": "user", "content": "Hello"}]}
         response = {"id": "123", "choices": [{"content": "Hi"}]}
 
@@ -58,8 +57,8 @@ class TestRequestCache:
         # Should be present immediately
         assert cache.get(request) == response
 
-        # Wait for expiration
-        time.sleep(1.1)
+        # Advance the clock past the TTL instead of sleeping
+        fake_now[0] += 1.1
 
         # Should be expired now
         assert cache.get(request) is None
@@ -177,7 +176,8 @@ class TestRequestCache:
 
     def test_cleanup_expired(self):
         """cleanup_expired removes expired entries."""
-        cache = RequestCache(enabled=True, max_size=10, ttl_seconds=1)
+        fake_now = [1000.0]
+        cache = RequestCache(enabled=True, max_size=10, ttl_seconds=1, clock=lambda: fake_now[0])
 
         request1 = {"model": "test", "messages": [{"role": "user", "content": "One"}]}
         request2 = {"model": "test", "messages": [{"role": "user", "content": "Two"}]}
@@ -185,8 +185,8 @@ class TestRequestCache:
         cache.set(request1, {"id": "1"})
         cache.set(request2, {"id": "2"})
 
-        # Wait for expiration
-        time.sleep(1.1)
+        # Advance the clock past the TTL instead of sleeping
+        fake_now[0] += 1.1
 
         removed = cache.cleanup_expired()
 
@@ -225,15 +225,13 @@ class TestCacheEntry:
         assert entry.response == {"id": "test"}
         assert entry.created_at == 1000.0
         assert entry.expires_at == 1060.0
-        assert entry.hit_count == 0  # Default
 
-    def test_cache_entry_hit_count(self):
-        """CacheEntry hit_count can be specified."""
+    def test_cache_entry_has_no_dict(self):
+        """CacheEntry is slotted; instances carry no __dict__."""
         entry = CacheEntry(
             response={"id": "test"},
             created_at=1000.0,
             expires_at=1060.0,
-            hit_count=5,
         )
 
-        assert entry.hit_count == 5
+        assert not hasattr(entry, "__dict__")